@@ -3,7 +3,7 @@
 
 from typing import Tuple, List
 
-from pygame import *
+from pygame.locals import K_a, K_d, K_w, K_s, K_LEFT, K_RIGHT, K_UP, K_DOWN
 
 from nshoot.strategy import Strategy, IdleStrategy, UserInputStrategy, BounceStrategy, SemiSmartStrategy, SmartStrategy
 
@@ -18,11 +18,19 @@ SHOOT_SOURCES: List[Tuple[int, int, int, int]] = [(K_LEFT, K_RIGHT, K_UP, K_DOWN
 
 DEFAULT_NUM_PLAYERS: int = 2
 DEFAULT_PLAYER_IDS: List[str] = ["p1", "p2"]
-DEFAULT_STRATEGIES: List[Strategy] = [UserInputStrategy(DEFAULT_PLAYER_IDS[0], MOVE_SOURCES[0], SHOOT_SOURCES[0]),
-                                      SmartStrategy(DEFAULT_PLAYER_IDS[1])]
 
 DEFAULT_STATS = (1000, 400, 10, 10, 100)
 DEFAULT_PLAYER_STATS: List[Tuple[int, int, int, int]] = [DEFAULT_STATS, DEFAULT_STATS]
 DEFAULT_BULLET_SPEED: int = 800
+MAX_BULLETS: int = 1024
 
 REFRESH_RATE: int = 60
+SIMULATION_RATE: int = 120
+MAX_FRAME_TIME: float = 0.25
+
+
+def default_strategies() -> List[Strategy]:
+    """Returns newly created default strategies for each of the default players.
+    """
+    return [UserInputStrategy(DEFAULT_PLAYER_IDS[0], MOVE_SOURCES[0], SHOOT_SOURCES[0]),
+            SmartStrategy(DEFAULT_PLAYER_IDS[1])]
@@ -3,117 +3,174 @@
 This module manages all aspects of players in the game from movement to drawing.
 """
 
-from typing import Optional
-
-import time
+from typing import Optional, List, Tuple
 
+import numpy as np
 import pygame
-from nshoot import config
+from nshoot import config, kernels
 from nshoot.strategy import Strategy
-from nshoot.info import PlayerInformation, BulletInformation
+from nshoot.info import PlayerInformation
 from nshoot.utils import Vector, Bounds
 
 
 class Element:
     """An element in the game that can be drawn.
     """
-    def draw(self, surface: pygame.Surface) -> None:
-        """Draws this element to the surface.
+    __slots__ = ()
+
+    def draw(self, surface: pygame.Surface) -> List[pygame.Rect]:
+        """Draws this element to the surface and returns the areas of the surface that were drawn over.
         """
         raise NotImplementedError
 
 
-class Bullet(Element):
-    """A bullet in the game.
-    """
-    COLOR: pygame.Color = pygame.Color("lightcoral")
-    RADIUS: int = 5
+class BulletPool(Element):
+    """A pool of all bullets in the game stored as parallel arrays.
 
-    direction: Vector
-    position: Vector
-    damage: int
-    speed: int
+    The bullets alive in the pool are always packed into the first <count> entries of each array, so shooting
+    reuses the slot after the last alive bullet instead of allocating a new bullet.
+    """
+    __slots__ = ("capacity", "count", "pos_x", "pos_y", "dir_x", "dir_y", "speed", "damage")
 
-    def __init__(self, origin: Vector, direction: Vector, damage: int, speed: int) -> None:
-        """Initializes a bullet travelling from an <origin> in a given <direction> at a given <speed>.
+    COLOR: Tuple[int, int, int] = (240, 128, 128)  # lightcoral
+    RADIUS: int = 5
+    SCREEN_WIDTH: int = config.WIDTH
+    SCREEN_HEIGHT: int = config.HEIGHT
+    _sprite: Optional[pygame.Surface] = None
+
+    capacity: int
+    count: int
+    pos_x: np.ndarray
+    pos_y: np.ndarray
+    dir_x: np.ndarray
+    dir_y: np.ndarray
+    speed: np.ndarray
+    damage: np.ndarray
+
+    def __init__(self, capacity: int = config.MAX_BULLETS) -> None:
+        """Initializes an empty bullet pool that can hold at most <capacity> bullets at once.
         """
-        self.position = origin
-        self.direction = direction.normalize()
-        self.damage = damage
-        self.speed = speed
-
-    def __eq__(self, other: object) -> bool:
-        """Returns whether or not two bullet objects are equal.
+        self.capacity = capacity
+        self.count = 0
+        self.pos_x = np.zeros(capacity, dtype=np.float32)
+        self.pos_y = np.zeros(capacity, dtype=np.float32)
+        self.dir_x = np.zeros(capacity, dtype=np.float32)
+        self.dir_y = np.zeros(capacity, dtype=np.float32)
+        self.speed = np.zeros(capacity, dtype=np.float32)
+        self.damage = np.zeros(capacity, dtype=np.float32)
+
+    def __len__(self) -> int:
+        """Returns the number of bullets alive in this pool.
         """
-        if type(self) != type(other):
-            return False
-        other: Bullet
-        return (self.RADIUS == other.RADIUS and self.damage == other.damage
-                and self.position == other.position and self.direction == other.direction and self.speed == other.speed)
-
-    def __str__(self) -> str:
-        """Return a human-readable representation of this bounds object.
+        return self.count
 
-        In the form ```Bullet <position>: direction - <direction>, damage - <damage>, speed - <speed>```.
+    def spawn(self, origin: Vector, direction: Vector, damage: int, speed: int) -> Optional[int]:
+        """Spawns a bullet travelling from an <origin> in a given unit <direction> at a given <speed> at the end of
+        this pool and returns its index, or None if the pool is full.
         """
-        return "Bullet {}: direction - {}, damage - {}, speed - {}".format(str(self.position)[6:],
-                                                                           str(self.direction)[6:],
-                                                                           str(self.damage), str(self.speed))
-
-    def __repr__(self):
-        """Return a mechanical representation of this bounds object.
+        index = self.count
+        if index == self.capacity:
+            return None
 
-        In the form ```<nshoot.elements.Bullet (<memory address>)>```.
+        self.pos_x[index] = origin.x
+        self.pos_y[index] = origin.y
+        self.dir_x[index] = direction.x
+        self.dir_y[index] = direction.y
+        self.speed[index] = speed
+        self.damage[index] = damage
+        self.count += 1
+        return index
+
+    def get_arrays(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Returns copies of the positions and the directions of every bullet alive in this pool as (bullets, 2)
+        arrays, in the same order.
         """
-        return "nshoot.elements.Bullet ({})".format(id(self))
+        n = self.count
+        return (np.stack((self.pos_x[:n], self.pos_y[:n]), axis=1),
+                np.stack((self.dir_x[:n], self.dir_y[:n]), axis=1))
 
-    def get_info(self) -> BulletInformation:
-        """Gets important information about this bullet.
+    def move_all(self, delta_time: float) -> np.ndarray:
+        """Moves every bullet in its direction with the given <delta_time> modifier and returns a mask of the bullets
+        alive in this pool that are now out of bounds of the screen.
         """
-        return BulletInformation(self.RADIUS, self.position, self.direction)
+        n = self.count
+        return kernels.step_bullets(self.pos_x[:n], self.pos_y[:n], self.dir_x[:n], self.dir_y[:n], self.speed[:n],
+                                    delta_time, self.SCREEN_WIDTH, self.SCREEN_HEIGHT)
 
-    def move(self, delta_time: float) -> None:
-        """Moves this bullet in its direction with the given <delta_time> modifier.
+    def collide(self, positions: np.ndarray, radius: float) -> np.ndarray:
+        """Returns for every bullet alive in this pool the index of the first of the (targets, 2) <positions> of
+        circular targets of the given <radius> that it touches, or -1 if it touches none.
         """
-        self.position += Vector(1, 1) * self.direction * self.speed * delta_time
+        n = self.count
+        return kernels.first_hits(self.pos_x[:n], self.pos_y[:n], positions, radius + self.RADIUS)
 
-    def out_of_bounds(self) -> bool:
-        """Returns whether or not this bullet is out of bounds of the screen.
+    def kill(self, mask: np.ndarray) -> None:
+        """Removes all bullets in the given <mask> from this pool, compacting the remaining bullets in place.
         """
-        x_out = self.position.x > config.WIDTH or self.position.x < 0
-        y_out = self.position.y > config.HEIGHT or self.position.y < 0
-        return x_out or y_out
-
-    def draw(self, surface: pygame.Surface) -> None:
-        """Draws the bullet to the given <surface>.
+        if not mask.any():
+            return
+
+        keep = ~mask
+        count = int(np.count_nonzero(keep))
+        for array in (self.pos_x, self.pos_y, self.dir_x, self.dir_y, self.speed, self.damage):
+            array[:count] = array[:self.count][keep]
+        self.count = count
+
+    @classmethod
+    def _get_sprite(cls) -> pygame.Surface:
+        """Returns a surface with a single bullet drawn on it, rendering it the first time it is needed.
         """
-        pos = round(self.position)
-        pygame.draw.circle(surface, self.COLOR, (pos.x, pos.y), self.RADIUS)
+        if cls._sprite is None:
+            cls._sprite = pygame.Surface((2 * cls.RADIUS, 2 * cls.RADIUS), pygame.SRCALPHA)
+            pygame.draw.circle(cls._sprite, cls.COLOR, (cls.RADIUS, cls.RADIUS), cls.RADIUS)
+        return cls._sprite
+
+    def draw(self, surface: pygame.Surface) -> List[pygame.Rect]:
+        """Draws every bullet alive in this pool to the given <surface> in a single batch and returns the areas of
+        the surface that were drawn over.
+        """
+        n = self.count
+        sprite = self._get_sprite()
+        xs = (np.rint(self.pos_x[:n]).astype(np.int32) - self.RADIUS).tolist()
+        ys = (np.rint(self.pos_y[:n]).astype(np.int32) - self.RADIUS).tolist()
+        return surface.blits([(sprite, corner) for corner in zip(xs, ys)])
 
 
 class Player(Element):
     """A player in the game.
     """
-    BASE_COLOR: pygame.Color = pygame.Color("cornsilk")
-    HURT_COLOR: pygame.Color = pygame.Color("indianred")
+    __slots__ = ("_player_id", "damage", "max_health", "health", "acceleration", "max_speed", "_firerate",
+                 "_shot_interval", "shot_cooldown", "position", "velocity", "bounds", "_padded_bounds",
+                 "strategy", "color", "_sprite")
+
+    BASE_COLOR: Tuple[int, int, int, int] = (255, 248, 220, 255)  # cornsilk
+    HURT_COLOR: Tuple[int, int, int, int] = (205, 92, 92, 255)  # indianred
+    HURT_TO_BASE: Tuple[int, int, int, int] = tuple(base - hurt for base, hurt in zip(BASE_COLOR, HURT_COLOR))
     RADIUS: int = 15
+    CONTACT_DISTANCE: int = 2 * RADIUS
+    CONTACT_DISTANCE_SQUARED: int = CONTACT_DISTANCE * CONTACT_DISTANCE
 
     DRAG = 1000
+    BULLET_SPEED: int = config.DEFAULT_BULLET_SPEED
 
     damage: int
     max_health: int
     health: int
 
     acceleration: int
-    firerate: int
+    max_speed: int
+    _firerate: float
+    _shot_interval: float
 
-    last_shot_time: float
+    shot_cooldown: float
     position: Vector
     velocity: Vector
     bounds: Bounds
+    _padded_bounds: Bounds
     strategy: Strategy
 
-    color: pygame.Color
+    color: Tuple[int, int, int, int]
+    _sprite: Optional[pygame.Surface]
 
     def __init__(self, player_id: str,
                  acceleration: float, max_speed: float,
@@ -133,13 +190,15 @@ class Player(Element):
         self.max_speed = max_speed
         self.firerate = firerate
 
-        self.last_shot_time = time.time()
+        self.shot_cooldown = 0.0
         self.position = Vector(0, 0)
         self.velocity = Vector(0, 0)
         self.bounds = Bounds()
+        self._padded_bounds = self.bounds.with_padding(self.RADIUS)
         self.strategy = strategy
 
-        self.color = pygame.Color(self.BASE_COLOR.r, self.BASE_COLOR.g, self.BASE_COLOR.b, self.BASE_COLOR.a)
+        self.color = self.BASE_COLOR
+        self._sprite = None
 
     @property
     def player_id(self) -> str:
@@ -147,6 +206,19 @@ class Player(Element):
         """
         return self._player_id
 
+    @property
+    def firerate(self) -> float:
+        """Returns the number of bullets this player can shoot per second.
+        """
+        return self._firerate
+
+    @firerate.setter
+    def firerate(self, firerate: float) -> None:
+        """Sets the number of bullets this player can shoot per second to <firerate>.
+        """
+        self._firerate = firerate
+        self._shot_interval = 1 / firerate
+
     def get_info(self) -> PlayerInformation:
         """Gets important information about this player.
         """
@@ -155,31 +227,7 @@ class Player(Element):
     def _bound(self) -> None:
         """Bounds the player's position to satisfy bounds.
         """
-        self.bounds.bound_position(self.position, self.RADIUS)
-
-    def _bound_move(self, delta_position: Vector) -> None:
-        """Bounds the player's movement <delta_position> in-place to not exceed boundaries.
-        """
-        if self.bounds.x_min is not None:
-            x_min_padding = self.bounds.x_min - self.position.x + self.RADIUS
-            if delta_position.x < x_min_padding:
-                delta_position.x = x_min_padding
-                self.velocity.x = 0
-        if self.bounds.x_max is not None:
-            x_max_padding = self.bounds.x_max - self.position.x - self.RADIUS
-            if delta_position.x > x_max_padding:
-                delta_position.x = x_max_padding
-                self.velocity.x = 0
-        if self.bounds.y_min is not None:
-            y_min_padding = self.bounds.y_min - self.position.y + self.RADIUS
-            if delta_position.y < y_min_padding:
-                delta_position.y = y_min_padding
-                self.velocity.y = 0
-        if self.bounds.y_max is not None:
-            y_max_padding = self.bounds.y_max - self.position.y - self.RADIUS
-            if delta_position.y > y_max_padding:
-                delta_position.y = y_max_padding
-                self.velocity.y = 0
+        self._padded_bounds.bound_position(self.position, 0)
 
     def set_position(self, position: Vector) -> None:
         """Sets the position of this player.
@@ -191,52 +239,93 @@ class Player(Element):
         """Sets the bounds of this player.
         """
         self.bounds = bounds
+        self._padded_bounds = bounds.with_padding(self.RADIUS)
         self._bound()
 
     def move(self, direction: Vector, delta_time: float) -> None:
         """Move the player in the direction specified by the <direction> and with the given <delta_time> modifier.
         """
-        if direction == Vector.zero():
-            self.velocity -= self.velocity.normalize() * self.DRAG * delta_time
+        if direction.x == 0 and direction.y == 0:
+            self.velocity.iadd_vec(self.velocity.normalize() * (-self.DRAG * delta_time))
         else:
-            self.velocity += direction.seminormalize(1) * self.acceleration * delta_time
-        self.velocity = self.velocity.seminormalize(self.max_speed)
-
-        delta_position = self.velocity * delta_time
-        self._bound_move(delta_position)
-
-        self.position += delta_position
+            if direction.x * direction.x + direction.y * direction.y > 1:
+                direction = direction.normalize()
+            self.velocity.iadd_vec(direction * (self.acceleration * delta_time))
+        self.velocity = velocity = self.velocity.seminormalize(self.max_speed)
+
+        # The movement is clamped inline on plain floats so that no intermediate vectors or calls are made per step
+        position, bounds = self.position, self._padded_bounds
+        x = position.x + velocity.x * delta_time
+        y = position.y + velocity.y * delta_time
+        if x < bounds.x_min:
+            x = bounds.x_min
+            velocity.x = 0
+        if x > bounds.x_max:
+            x = bounds.x_max
+            velocity.x = 0
+        if y < bounds.y_min:
+            y = bounds.y_min
+            velocity.y = 0
+        if y > bounds.y_max:
+            y = bounds.y_max
+            velocity.y = 0
+        position.x = x
+        position.y = y
+
+    def push(self, offset: Vector) -> None:
+        """Pushes the player by the given <offset> without leaving its bounds.
+        """
+        self.position.iadd_vec(offset)
+        self._bound()
 
-    def shoot(self, direction: Vector) -> Optional[Bullet]:
-        """Shoots a bullet in the given <direction> and returns the shot bullet.
+    def shoot(self, direction: Vector, bullets: BulletPool, delta_time: float) -> Optional[int]:
+        """Shoots a bullet in the given <direction> into the pool of <bullets> once the shot cooldown has run out after
+        the given <delta_time> and returns the index of the shot bullet.
         """
-        if time.time() < self.last_shot_time + (1 / self.firerate) or direction == Vector.zero():
+        self.shot_cooldown -= delta_time
+        if self.shot_cooldown > 0:
+            return None
+        if direction.x == 0 and direction.y == 0:
+            # A ready player that holds its fire does not save up shots for later
+            self.shot_cooldown = 0.0
             return None
 
-        self.last_shot_time = time.time()
-        origin = Vector(1, 1) * self.position + direction.normalize() * (self.RADIUS + Bullet.RADIUS + 1)
-        return Bullet(origin, direction, self.damage, config.DEFAULT_BULLET_SPEED)
+        # Any time overshot past the cooldown counts towards the next shot so the firerate does not depend on steps
+        self.shot_cooldown += self._shot_interval
+        direction = direction.normalize()
+        origin = self.position.add_vec(direction * (self.RADIUS + BulletPool.RADIUS + 1))
+        return bullets.spawn(origin, direction, self.damage, self.BULLET_SPEED)
 
-    def hit(self, bullet: Bullet) -> None:
-        """Registers a hit on this player by the given <bullet>.
+    def hit(self, damage: int) -> None:
+        """Registers a hit on this player dealing the given <damage>.
         """
-        self.health -= bullet.damage
+        self.health -= damage
         if self.health <= 0:
             self.health = 0
 
         health_percent = self.health / self.max_health
-        self.color.r = int(self.HURT_COLOR.r + health_percent * (self.BASE_COLOR.r - self.HURT_COLOR.r))
-        self.color.g = int(self.HURT_COLOR.g + health_percent * (self.BASE_COLOR.g - self.HURT_COLOR.g))
-        self.color.b = int(self.HURT_COLOR.b + health_percent * (self.BASE_COLOR.b - self.HURT_COLOR.b))
-        self.color.a = int(self.HURT_COLOR.a + health_percent * (self.BASE_COLOR.a - self.HURT_COLOR.a))
+        hurt_r, hurt_g, hurt_b, hurt_a = self.HURT_COLOR
+        delta_r, delta_g, delta_b, delta_a = self.HURT_TO_BASE
+        self.color = (int(hurt_r + health_percent * delta_r), int(hurt_g + health_percent * delta_g),
+                      int(hurt_b + health_percent * delta_b), int(hurt_a + health_percent * delta_a))
+        self._sprite = None
 
     def is_dead(self) -> bool:
         """Returns whether or not this player is dead.
         """
         return self.health <= 0
 
-    def draw(self, surface: pygame.Surface) -> None:
-        """Draws the player to the given <surface>.
+    def _get_sprite(self) -> pygame.Surface:
+        """Returns a surface with this player drawn on it, rendering it again the first time it is needed after
+        the player changes color.
+        """
+        if self._sprite is None:
+            self._sprite = pygame.Surface((2 * self.RADIUS, 2 * self.RADIUS), pygame.SRCALPHA)
+            pygame.draw.circle(self._sprite, self.color, (self.RADIUS, self.RADIUS), self.RADIUS)
+        return self._sprite
+
+    def draw(self, surface: pygame.Surface) -> List[pygame.Rect]:
+        """Draws the player to the given <surface> and returns the area of the surface that was drawn over.
         """
-        pos = round(self.position)
-        pygame.draw.circle(surface, self.color, (pos.x, pos.y), self.RADIUS)
+        corner = (round(self.position.x) - self.RADIUS, round(self.position.y) - self.RADIUS)
+        return [surface.blit(self._get_sprite(), corner)]
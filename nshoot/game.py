@@ -3,34 +3,48 @@
 This module manages interaction of the user with the game, including viewing and input.
 """
 
-from typing import List, Tuple, Optional
+from typing import List, Tuple, Optional, Iterator
 
 import sys
+import math
 import random
+import itertools
 
+import numpy as np
 import pygame
 from nshoot import config
 from nshoot.info import GameInformation
-from nshoot.strategy import Strategy
-from nshoot.elements import Player, Bullet
+from nshoot.strategy import Strategy, UserInputStrategy
+from nshoot.elements import Player, BulletPool
+from nshoot.spatial_hash import SpatialHashGrid
 from nshoot.utils import Vector, Bounds
 
 
 class Game:
     """A game instance that controls all underlying aspects of the game including simulation.
     """
+    CONTACT_GRID_MIN_PAIRS: int = 1000
+
     players: List[Player]
-    bullets: List[Bullet]
+    bullets: BulletPool
+    contacts: SpatialHashGrid
+    positions: np.ndarray
 
     def __init__(self, num_players: int = config.DEFAULT_NUM_PLAYERS,
                  player_ids: List[str] = config.DEFAULT_PLAYER_IDS,
                  stats: Optional[List[Tuple[int, int, int, int]]] = None,
-                 strategies: List[Strategy] = config.DEFAULT_STRATEGIES):
+                 strategies: Optional[List[Strategy]] = None):
         """Initializes this game instance with the given number of players <num_players>
-        and the statistics of each player <stats> with the strategy of each player <strategy>.
+        and the statistics of each player <stats> with the strategy of each player <strategy>,
+        or the default strategies if none are given.
         """
         self.players = []
-        self.bullets = []
+        self.bullets = BulletPool()
+        self.contacts = SpatialHashGrid(Player.CONTACT_DISTANCE)
+        self.positions = np.empty((num_players, 2), dtype=np.float32)
+
+        if strategies is None:
+            strategies = config.default_strategies()
 
         stats = stats + [config.DEFAULT_STATS] * (num_players - len(stats))\
             if stats else config.DEFAULT_PLAYER_STATS
@@ -52,38 +66,69 @@ class Game:
         for player in self.players:
             player_information[player.player_id] = player.get_info()
 
-        bullet_information = []
-        for bullet in self.bullets:
-            bullet_information.append(bullet.get_info())
+        return GameInformation(player_information, BulletPool.RADIUS, *self.bullets.get_arrays())
 
-        return GameInformation(player_information, bullet_information)
+    def _contact_pairs(self) -> Iterator[Tuple[int, int]]:
+        """Yields the indices of every unordered pair of players that may be in contact, each pair only once.
 
-    def _register_hits(self) -> None:
-        """Registers hits from all bullets.
+        Games with fewer than CONTACT_GRID_MIN_PAIRS pairs of players check every pair directly, which is faster than
+        building a spatial hash for them, while larger games only pair up neighbouring players in a spatial hash.
         """
-        dead_bullets = []
-
-        for bullet in self.bullets:
-            if bullet.out_of_bounds():
-                dead_bullets.append(bullet)
+        players = self.players
+        count = len(players)
+        if count * (count - 1) // 2 < self.CONTACT_GRID_MIN_PAIRS:
+            yield from itertools.combinations(range(count), 2)
+            return
+
+        self.contacts.clear()
+        for index, player in enumerate(players):
+            self.contacts.insert(index, player.position.x, player.position.y, 0)
+        for index, player in enumerate(players):
+            for other_index in self.contacts.query(player.position.x, player.position.y, Player.CONTACT_DISTANCE):
+                if other_index > index:
+                    yield index, other_index
+
+    def _register_contacts(self) -> None:
+        """Pushes apart any overlapping players so that they are just touching.
+        """
+        players = self.players
+        for index, other_index in self._contact_pairs():
+            player, other_player = players[index], players[other_index]
+            dx = other_player.position.x - player.position.x
+            dy = other_player.position.y - player.position.y
+            distance_squared = dx * dx + dy * dy
+            if distance_squared >= Player.CONTACT_DISTANCE_SQUARED:
                 continue
 
-            for player in self.players:
-                dist = player.position.distance(bullet.position)
-                if dist <= player.RADIUS + bullet.RADIUS:
-                    player.hit(bullet)
-                    dead_bullets.append(bullet)
-                    break
+            distance = math.sqrt(distance_squared)
+            normal = Vector(dx / distance, dy / distance) if distance else Vector(1, 0)
+            push = normal * ((Player.CONTACT_DISTANCE - distance) / 2)
+            player.push(-push)
+            other_player.push(push)
 
-        for bullet in dead_bullets:
-            self.bullets.remove(bullet)
+    def _register_hits(self, out_of_bounds: np.ndarray) -> None:
+        """Registers hits from all bullets and removes them along with the bullets in the <out_of_bounds> mask.
+        """
+        dead = out_of_bounds
+        if self.players and self.bullets.count:
+            positions = self.positions[:len(self.players)]
+            for index, player in enumerate(self.players):
+                positions[index] = player.position.x, player.position.y
+            hits = self.bullets.collide(positions, Player.RADIUS)
+            hits[dead] = -1
+            hit_bullets = hits >= 0
+
+            damages = self.bullets.damage[:len(hits)][hit_bullets].tolist()
+            for player, damage in zip(hits[hit_bullets].tolist(), damages):
+                self.players[player].hit(damage)
+            dead |= hit_bullets
+
+        self.bullets.kill(dead)
 
     def _register_dead(self) -> None:
         """Registers any players that should be dead.
         """
-        for player in self.players:
-            if player.is_dead():
-                self.players.remove(player)
+        self.players = [player for player in self.players if not player.is_dead()]
 
     def update(self, delta_time: float) -> None:
         """Update the game internal state taking into consideration the given <delta_time>.
@@ -94,44 +139,41 @@ class Game:
             player.strategy.update_info(game_info)
             move_vector, shoot_vector = player.strategy.get_move()
             player.move(move_vector, delta_time)
+            player.shoot(shoot_vector, self.bullets, delta_time)
 
-            # TODO: fix horrible code
-            for other_player in self.players:
-                if other_player == player:
-                    continue
-                dist = player.position.distance(other_player.position)
-                if dist <= player.RADIUS + other_player.RADIUS:
-                    player.move(-move_vector, delta_time)
-                    break
-
-            bullet = player.shoot(shoot_vector)
-            if bullet is not None:
-                self.bullets.append(bullet)
+        self._register_contacts()
+        out_of_bounds = self.bullets.move_all(delta_time)
 
-        for bullet in self.bullets:
-            bullet.move(delta_time)
-
-        self._register_hits()
+        self._register_hits(out_of_bounds)
         self._register_dead()
 
-    def draw(self, surface: pygame.Surface) -> None:
-        """Draws all objects in this game to the given <surface>.
+    def draw(self, surface: pygame.Surface) -> List[pygame.Rect]:
+        """Draws all objects in this game to the given <surface> and returns the areas of the surface that were
+        drawn over.
         """
+        drawn = []
         for player in self.players:
-            player.draw(surface)
-        for bullet in self.bullets:
-            bullet.draw(surface)
+            drawn += player.draw(surface)
+        drawn += self.bullets.draw(surface)
+        return drawn
 
 
 class GameView:
     """A game view which controls all displaying and interaction with the game.
     """
-    COLOR: pygame.Color = pygame.Color('cadetblue4')
+    COLOR: Tuple[int, int, int] = (83, 134, 139)  # cadetblue4
+    REPAINT_EVENTS: Tuple[int, ...] = (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED, pygame.WINDOWSHOWN,
+                                       pygame.WINDOWRESTORED)
 
     surface: pygame.Surface
     clock: pygame.time.Clock
     game: Game
 
+    shoot_keys: Tuple[int, ...]
+    bang: Optional[pygame.mixer.Sound]
+    dirty: List[pygame.Rect]
+    repaint: bool
+
     def __init__(self, size: Tuple[int, int], caption: str) -> None:
         """Initializes this game view with the given `x` by `y` <size> and the given <caption>.
         """
@@ -142,39 +184,67 @@ class GameView:
         self.clock = pygame.time.Clock()
         self.game = Game()
 
+        self.shoot_keys = tuple(key for keys in config.SHOOT_SOURCES for key in keys)
+        self.bang = pygame.mixer.Sound("bang.ogg") if sys.platform == "darwin" else None
+
+        self.dirty = []
+        self.repaint = True
+
+        # Only quitting and the window being uncovered are handled as events, the keyboard is read directly so
+        # nothing else needs to be queued
+        pygame.event.set_blocked(None)
+        pygame.event.set_allowed((pygame.QUIT,) + self.REPAINT_EVENTS)
+
     def start(self) -> None:
-        """Start this game view and the underlying game.
+        """Start this game view and the underlying game, refreshing at most REFRESH_RATE times a second and updating
+        in fixed steps of 1 / SIMULATION_RATE seconds.
         """
-        since_last_refresh = 0
+        step = 1 / config.SIMULATION_RATE
+        unsimulated_time = 0.0
 
         while True:
-            delta_time = self.clock.get_time() / 1000
-            since_last_refresh += delta_time
-            self.clock.tick()
-
-            self.update(delta_time)
-            if since_last_refresh > 1 / config.REFRESH_RATE:
-                self.refresh()
-                since_last_refresh = 0
+            # Dropping time after a long stall keeps the simulation from falling further and further behind
+            unsimulated_time = min(unsimulated_time + self.clock.tick(config.REFRESH_RATE) / 1000,
+                                   config.MAX_FRAME_TIME)
+            self.poll_events()
+            # The time since the last frame runs as whole fixed steps, and any remainder carries over to the next frame
+            while unsimulated_time >= step:
+                self.update(step)
+                unsimulated_time -= step
+            self.refresh()
 
     def update(self, delta_time: float) -> None:
-        """Updates the game view considering the given given <delta_time>
-        which is the time elapsed since the last frame in seconds.
+        """Updates the game view by one simulation step of the given <delta_time> in seconds, which is always
+        1 / SIMULATION_RATE however long the last frame took, so several steps may run for a single frame.
         """
         self.game.update(delta_time)
 
-    def refresh(self) -> None:
-        """Refreshes the display to redraw everything.
+    def poll_events(self) -> None:
+        """Handles all pending events, bringing the keyboard state up to date before the game is updated.
         """
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 sys.exit()
+            self.repaint = True
+        UserInputStrategy.poll_keyboard()
 
+    def refresh(self) -> None:
+        """Refreshes the display, only clearing and redrawing the areas covered by the game last frame and this frame
+        unless the whole window needs to be repainted.
+        """
         if sys.platform == "darwin":
-            pressed = pygame.key.get_pressed()
-            if any(pressed[key] for key in sum(config.SHOOT_SOURCES, ())):
-                pygame.mixer.Sound('bang.ogg').play()
-
-        self.surface.fill(self.COLOR)
-        self.game.draw(self.surface)
-        pygame.display.flip()
+            pressed = UserInputStrategy.pressed
+            if any(map(pressed.__getitem__, self.shoot_keys)):
+                self.bang.play()
+
+        if self.repaint:
+            self.surface.fill(self.COLOR)
+            drawn = self.game.draw(self.surface)
+            pygame.display.flip()
+            self.repaint = False
+        else:
+            for rect in self.dirty:
+                self.surface.fill(self.COLOR, rect)
+            drawn = self.game.draw(self.surface)
+            pygame.display.update(self.dirty + drawn)
+        self.dirty = drawn
@@ -3,50 +3,82 @@
 This module contains data holders that manage information about the game and players.
 """
 
-from typing import List, Dict
+from typing import List, Dict, Optional
 
+import numpy as np
 from nshoot.utils import Vector, Bounds
 
 
 class PlayerInformation:
     """Contains information about a player.
     """
+    __slots__ = ("radius", "position", "bounds")
+
     radius: int
     position: Vector
     bounds: Bounds
 
     def __init__(self, radius: int, position: Vector, bounds: Bounds) -> None:
-        """Initialize this player information.
+        """Initialize this player information with a copy of the given <position>, which players move in place.
+        The <bounds> are shared as they are only ever replaced, never modified.
         """
         self.radius = radius
         self.position = position.duplicate()
-        self.bounds = bounds.duplicate()
+        self.bounds = bounds
 
 
 class BulletInformation:
     """Contains information about a bullet.
     """
+    __slots__ = ("radius", "position", "direction")
+
     radius: int
     position: Vector
     direction: Vector
 
     def __init__(self, radius: int, position: Vector, direction: Vector) -> None:
-        """Initialize this bullet information.
+        """Initialize this bullet information, taking ownership of the given <position> and <direction>.
         """
         self.radius = radius
-        self.position = position.duplicate()
-        self.direction = direction.duplicate()
+        self.position = position
+        self.direction = direction
 
 
 class GameInformation:
     """Contains information about the current game state.
     """
+    __slots__ = ("players", "bullet_radius", "bullet_pos", "bullet_dir", "_bullets")
+
     players: Dict[str, PlayerInformation]
-    bullets: List[BulletInformation]
+    bullet_radius: int
+    bullet_pos: np.ndarray
+    bullet_dir: np.ndarray
+    _bullets: Optional[List[BulletInformation]]
 
-    def __init__(self, players: Dict[str, PlayerInformation] = None,
-                 bullets: List[BulletInformation] = None) -> None:
-        """Initialize the information in the game.
+    def __init__(self, players: Dict[str, PlayerInformation] = None, bullet_radius: int = 0,
+                 bullet_pos: Optional[np.ndarray] = None, bullet_dir: Optional[np.ndarray] = None) -> None:
+        """Initialize the information in the game, where the (bullets, 2) arrays <bullet_pos> and <bullet_dir> hold
+        the position and direction of every bullet, each of radius <bullet_radius>.
         """
         self.players = players if players else {}
-        self.bullets = bullets if bullets else []
+        self.bullet_radius = bullet_radius
+        self.bullet_pos = bullet_pos if bullet_pos is not None else np.empty((0, 2), dtype=np.float32)
+        self.bullet_dir = bullet_dir if bullet_dir is not None else np.empty((0, 2), dtype=np.float32)
+        self._bullets = None
+
+    @property
+    def bullets(self) -> List[BulletInformation]:
+        """Returns the information of every bullet, only built the first time it is asked for.
+        """
+        if self._bullets is None:
+            self._bullets = [self.get_bullet(index) for index in range(len(self.bullet_pos))]
+        return self._bullets
+
+    def get_bullet(self, index: int) -> BulletInformation:
+        """Returns the information of the bullet at <index> in the bullet arrays.
+        """
+        if self._bullets is not None:
+            return self._bullets[index]
+        x, y = self.bullet_pos[index].tolist()
+        dx, dy = self.bullet_dir[index].tolist()
+        return BulletInformation(self.bullet_radius, Vector(x, y), Vector(dx, dy))
@@ -0,0 +1,93 @@
+"""Numeric kernels for the game simulation.
+
+This module contains the numeric inner loops of the simulation that run over whole arrays of elements. They are
+compiled with numba when it is installed, and fall back to equivalent vectorized NumPy code otherwise. The numba
+kernels are compiled for the argument types the game passes them as soon as this module is imported, so that none of
+the compilation happens inside the game loop.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+
+if njit is None:
+    def step_bullets(pos_x: np.ndarray, pos_y: np.ndarray, dir_x: np.ndarray, dir_y: np.ndarray,
+                     speed: np.ndarray, delta_time: float, width: float, height: float) -> np.ndarray:
+        """Moves every bullet in place in its direction with the given <delta_time> modifier and returns a mask of
+        the bullets that left the <width> by <height> screen.
+        """
+        pos_x += dir_x * speed * delta_time
+        pos_y += dir_y * speed * delta_time
+        return (pos_x < 0) | (pos_x > width) | (pos_y < 0) | (pos_y > height)
+
+    def first_hits(pos_x: np.ndarray, pos_y: np.ndarray, targets: np.ndarray, reach: float) -> np.ndarray:
+        """Returns for every bullet the index of the first of the (targets, 2) <targets> within <reach> of it,
+        or -1 if there is none.
+        """
+        dx = pos_x[:, None] - targets[None, :, 0]
+        dy = pos_y[:, None] - targets[None, :, 1]
+        touching = dx * dx + dy * dy <= reach * reach
+        return np.where(touching.any(axis=1), touching.argmax(axis=1), -1)
+
+    def closest_approaching(x: float, y: float, positions: np.ndarray, directions: np.ndarray) -> int:
+        """Returns the index of the closest of the (bullets, 2) <positions> to the point (<x>, <y>) that gets closer
+        to it when moved by its corresponding one of the (bullets, 2) <directions>, or -1 if there is none.
+        """
+        offsets = positions - np.array((x, y), dtype=positions.dtype)
+        next_offsets = offsets + directions
+        distances_squared = np.einsum("ij,ij->i", offsets, offsets)
+        approaching = np.flatnonzero(np.einsum("ij,ij->i", next_offsets, next_offsets) < distances_squared)
+        return int(approaching[distances_squared[approaching].argmin()]) if len(approaching) else -1
+else:
+    @njit("(float32[::1], float32[::1], float32[::1], float32[::1], float32[::1], float64, float64, float64)",
+          cache=True, fastmath=True)
+    def step_bullets(pos_x: np.ndarray, pos_y: np.ndarray, dir_x: np.ndarray, dir_y: np.ndarray,
+                     speed: np.ndarray, delta_time: float, width: float, height: float) -> np.ndarray:
+        """Moves every bullet in place in its direction with the given <delta_time> modifier and returns a mask of
+        the bullets that left the <width> by <height> screen.
+        """
+        out_of_bounds = np.empty(pos_x.shape[0], dtype=np.bool_)
+        for i in range(pos_x.shape[0]):
+            pos_x[i] += dir_x[i] * speed[i] * delta_time
+            pos_y[i] += dir_y[i] * speed[i] * delta_time
+            out_of_bounds[i] = pos_x[i] < 0 or pos_x[i] > width or pos_y[i] < 0 or pos_y[i] > height
+        return out_of_bounds
+
+    @njit("(float32[::1], float32[::1], float32[:, ::1], float64)", cache=True, fastmath=True)
+    def first_hits(pos_x: np.ndarray, pos_y: np.ndarray, targets: np.ndarray, reach: float) -> np.ndarray:
+        """Returns for every bullet the index of the first of the (targets, 2) <targets> within <reach> of it,
+        or -1 if there is none.
+        """
+        reach_squared = reach * reach
+        hits = np.full(pos_x.shape[0], -1, dtype=np.int64)
+        for i in range(pos_x.shape[0]):
+            for j in range(targets.shape[0]):
+                dx = pos_x[i] - targets[j, 0]
+                dy = pos_y[i] - targets[j, 1]
+                if dx * dx + dy * dy <= reach_squared:
+                    hits[i] = j
+                    break
+        return hits
+
+    @njit("(float64, float64, float32[:, ::1], float32[:, ::1])", cache=True, fastmath=True)
+    def closest_approaching(x: float, y: float, positions: np.ndarray, directions: np.ndarray) -> int:
+        """Returns the index of the closest of the (bullets, 2) <positions> to the point (<x>, <y>) that gets closer
+        to it when moved by its corresponding one of the (bullets, 2) <directions>, or -1 if there is none.
+        """
+        closest = -1
+        closest_distance_squared = 0.0
+        for i in range(positions.shape[0]):
+            dx = positions[i, 0] - x
+            dy = positions[i, 1] - y
+            distance_squared = dx * dx + dy * dy
+            next_dx = dx + directions[i, 0]
+            next_dy = dy + directions[i, 1]
+            if next_dx * next_dx + next_dy * next_dy < distance_squared \
+                    and (closest < 0 or distance_squared < closest_distance_squared):
+                closest = i
+                closest_distance_squared = distance_squared
+        return closest
@@ -0,0 +1,62 @@
+"""Spatial hashing of game elements.
+
+This module contains a uniform grid that buckets elements by position to quickly find the elements near a point.
+"""
+
+from typing import Any, Dict, List, Set
+
+import math
+
+
+class SpatialHashGrid:
+    """A uniform grid of square cells that buckets items by the cells their bounding box overlaps.
+
+    Cells are keyed by a prime-multiplication XOR hash of their coordinates, so two distant cells may share a bucket;
+    queries can therefore return extra items, but never miss one.
+    """
+    __slots__ = ("cell_size", "buckets")
+
+    cell_size: float
+    buckets: Dict[int, List[Any]]
+
+    def __init__(self, cell_size: float) -> None:
+        """Initialize an empty spatial hash grid with square cells of side <cell_size>.
+        """
+        self.cell_size = cell_size
+        self.buckets = {}
+
+    def _keys(self, x: float, y: float, radius: float) -> List[int]:
+        """Returns the keys of all cells overlapped by the box of half-side <radius> centred at <x>, <y>.
+        """
+        cell_size = self.cell_size
+        x_min, x_max = math.floor((x - radius) / cell_size), math.floor((x + radius) / cell_size)
+        y_min, y_max = math.floor((y - radius) / cell_size), math.floor((y + radius) / cell_size)
+        return [(cx * 73856093) ^ (cy * 19349663)
+                for cx in range(x_min, x_max + 1) for cy in range(y_min, y_max + 1)]
+
+    def clear(self) -> None:
+        """Removes all items from this grid.
+        """
+        self.buckets.clear()
+
+    def insert(self, item: Any, x: float, y: float, radius: float) -> None:
+        """Inserts the given <item> of the given <radius> centred at <x>, <y>.
+        """
+        buckets = self.buckets
+        for key in self._keys(x, y, radius):
+            bucket = buckets.get(key)
+            if bucket is None:
+                buckets[key] = [item]
+            else:
+                bucket.append(item)
+
+    def query(self, x: float, y: float, radius: float) -> Set[Any]:
+        """Returns all items that may overlap the box of half-side <radius> centred at <x>, <y>.
+        """
+        buckets = self.buckets
+        found = set()
+        for key in self._keys(x, y, radius):
+            bucket = buckets.get(key)
+            if bucket is not None:
+                found.update(bucket)
+        return found
@@ -3,24 +3,51 @@
 This module manages and executes the different strategies available for a player.
 """
 
-from typing import Tuple, Optional
+from typing import Tuple, Dict, Optional, Sequence
 
 import pygame
+from nshoot import kernels
 from nshoot.info import GameInformation, PlayerInformation, BulletInformation
-from nshoot.utils import Vector
+from nshoot.utils import Vector, FrozenVector
+
+
+# The direction of every combination of held WEST EAST NORTH SOUTH keys, indexed by the bitmask of the held keys,
+# shared between frames and frozen so that no user can modify them in place
+_KEY_DIRECTIONS: Tuple[Vector, ...] = tuple(
+    FrozenVector(float((mask >> 1 & 1) - (mask & 1)), float((mask >> 3 & 1) - (mask >> 2 & 1))) for mask in range(16))
+
+# The move and shoot directions of every combination of held move and shoot keys, indexed by the bitmask of the
+# held move keys in the low four bits and of the held shoot keys in the high four bits
+_KEY_MOVES: Tuple[Tuple[Vector, Vector], ...] = tuple(
+    (_KEY_DIRECTIONS[mask & 15], _KEY_DIRECTIONS[mask >> 4]) for mask in range(256))
+
+# Every direction with components of -1, 0 or 1, shared between frames and frozen so that no user can modify them
+# in place
+_DIRECTIONS: Dict[Tuple[int, int], Vector] = {(x, y): FrozenVector(x, y) for x in (-1, 0, 1) for y in (-1, 0, 1)}
+_ZERO: Vector = _DIRECTIONS[0, 0]
+
+# The moves of the bounce strategy going down and up
+_BOUNCE_DOWN: Tuple[Vector, Vector] = (_DIRECTIONS[0, 1], _DIRECTIONS[1, 0])
+_BOUNCE_UP: Tuple[Vector, Vector] = (_DIRECTIONS[0, -1], _DIRECTIONS[-1, 0])
 
 
 class Strategy:
     """Abstract strategy that a play can use to move and shoot.
     """
+    __slots__ = ("player_id", "target_id", "info", "me")
+
     player_id: str
+    target_id: str
     info: GameInformation
+    me: Optional[PlayerInformation]
 
     def __init__(self, player_id: str) -> None:
-        """Initializes this strategy with empty game information and the given <player_id>.
+        """Initializes this strategy with empty game information, itself as target and the given <player_id>.
         """
         self.player_id = player_id
+        self.target_id = player_id
         self.info = GameInformation()
+        self.me = None
 
     def get_move(self) -> Tuple[Vector, Vector]:
         """Get the next move the player should make.
@@ -28,30 +55,43 @@ class Strategy:
         raise NotImplementedError
 
     def update_info(self, info: GameInformation) -> None:
-        """Updates this strategy's state based on the given player information.
+        """Updates this strategy's state based on the given player information, including the information about
+        its own player.
         """
         self.info = info
+        self.me = info.players.get(self.player_id)
 
     def _select_random_target(self) -> str:
-        """Selects a random target player.
+        """Selects a random target player and keeps it for as long as it is in the game, or targets itself if it is
+        the only player left.
         """
-        for key in self.info.players.keys():
-            if key != self.player_id:
-                return key
+        if self.target_id == self.player_id or self.target_id not in self.info.players:
+            self.target_id = self.player_id
+            for key in self.info.players.keys():
+                if key != self.player_id:
+                    self.target_id = key
+                    break
+        return self.target_id
 
 
 class IdleStrategy(Strategy):
     """Idle strategy that causes any player using it to never make any move.
     """
+    __slots__ = ()
+
     def get_move(self) -> Tuple[Vector, Vector]:
         """Get the next move the player should make. It does nothing in the idle strategy.
         """
-        return Vector.zero(), Vector.zero()
+        return _ZERO, _ZERO
 
 
 class UserInputStrategy(Strategy):
     """User input strategy that gets user input to determine the next move.
     """
+    __slots__ = ("move_keys", "shoot_keys")
+
+    pressed: Sequence[bool] = ()
+
     move_keys: Tuple[int, int, int, int]
     shoot_keys: Tuple[int, int, int, int]
 
@@ -64,42 +104,34 @@ class UserInputStrategy(Strategy):
         self.move_keys = move_keys
         self.shoot_keys = shoot_keys
 
+    @classmethod
+    def poll_keyboard(cls) -> None:
+        """Reads which keys are held once for every user input strategy, until the keyboard is polled again.
+        """
+        cls.pressed = pygame.key.get_pressed()
+
     def get_move(self) -> Tuple[Vector, Vector]:
         """Get the next move the player should make. Gets user input in the user input strategy.
         """
         return self.get_user_input()
 
     def get_user_input(self) -> Tuple[Vector, Optional[Vector]]:
-        """Gets the user raw input from all sources in a list.
+        """Gets the user raw input from all sources in a list, reading the keyboard directly if it was never polled.
         """
-        pressed = pygame.key.get_pressed()
-
-        move = [0.0, 0.0]
-        if pressed[self.move_keys[0]]:
-            move[0] -= 1
-        if pressed[self.move_keys[1]]:
-            move[0] += 1
-        if pressed[self.move_keys[2]]:
-            move[1] -= 1
-        if pressed[self.move_keys[3]]:
-            move[1] += 1
-
-        shoot = [0.0, 0.0]
-        if pressed[self.shoot_keys[0]]:
-            shoot[0] -= 1
-        if pressed[self.shoot_keys[1]]:
-            shoot[0] += 1
-        if pressed[self.shoot_keys[2]]:
-            shoot[1] -= 1
-        if pressed[self.shoot_keys[3]]:
-            shoot[1] += 1
-
-        return Vector(*move), Vector(*shoot)
+        pressed = self.pressed or pygame.key.get_pressed()
+        move_west, move_east, move_north, move_south = self.move_keys
+        shoot_west, shoot_east, shoot_north, shoot_south = self.shoot_keys
+
+        return _KEY_MOVES[pressed[move_west] | pressed[move_east] << 1 | pressed[move_north] << 2
+                          | pressed[move_south] << 3 | pressed[shoot_west] << 4 | pressed[shoot_east] << 5
+                          | pressed[shoot_north] << 6 | pressed[shoot_south] << 7]
 
 
 class BounceStrategy(Strategy):
     """Bounce strategy were the player bounces from the top of the screen to the bottom and fires east.
     """
+    __slots__ = ("going_down",)
+
     going_down: bool
 
     def __init__(self, player_id: str) -> None:
@@ -111,77 +143,50 @@ class BounceStrategy(Strategy):
     def get_move(self) -> Tuple[Vector, Vector]:
         """Get the next move the player should make.
         """
-        position = self.info.players[self.player_id].position
+        position = self.me.position
         if self.going_down:
             if position.y >= 785:
                 self.going_down = False
-                return self.get_move()
-            else:
-                return Vector(0, 1), Vector(1, 0)
-        else:
-            if position.y <= 15:
-                self.going_down = True
-                return self.get_move()
-            else:
-                return Vector(0, -1), Vector(-1, 0)
+        elif position.y <= 15:
+            self.going_down = True
+
+        return _BOUNCE_DOWN if self.going_down else _BOUNCE_UP
 
 
 class SemiSmartStrategy(Strategy):
     """Semi-smart strategy where the player lines up vertically and shoots to the correct direction of another player.
     """
-    target_id: str
-
-    def __init__(self, player_id: str) -> None:
-        """Initializes this semi-smart strategy with itself as target and with the given <player_id>.
-        """
-        super().__init__(player_id)
-        self.target_id = self.player_id
+    __slots__ = ()
 
     def get_move(self) -> Tuple[Vector, Vector]:
         """Get the next move the player should make.
         """
-        player_pos = self.info.players[self.player_id].position
+        player_pos = self.me.position
         target_pos = self.info.players[self._select_random_target()].position
 
-        shoot = (0, 0)
-        if target_pos.x < player_pos.x:
-            shoot = (-1, 0)
-        elif target_pos.x > player_pos.x:
-            shoot = (1, 0)
-
-        move = (0, 0)
-        if target_pos.y > player_pos.y:
-            move = (0, 1)
-        elif target_pos.y < player_pos.y:
-            move = (0, -1)
-
-        return Vector(*move), Vector(*shoot)
+        dx = target_pos.x - player_pos.x
+        dy = target_pos.y - player_pos.y
+        return _DIRECTIONS[0, (dy > 0) - (dy < 0)], _DIRECTIONS[(dx > 0) - (dx < 0), 0]
 
 
 class SmartStrategy(Strategy):
     """Smart strategy where the player dodges bullets vertically, lines up horizontally and vertically, and shoots
     to the correct direction of another player.
     """
-    target_id: str
-
-    def __init__(self, player_id: str) -> None:
-        """Initializes this bounce strategy going down with the given <player_id>.
-        """
-        super().__init__(player_id)
-        self.target_id = self.player_id
+    __slots__ = ()
 
     def get_move(self) -> Tuple[Vector, Vector]:
         """Get the next move the player should make.
         """
-        player = self.info.players[self.player_id]
+        player = self.me
         target = self.info.players[self._select_random_target()]
         bullet = self._get_closest_dangerous_bullet()
-        bounds = self.info.players[self.player_id].bounds
+        bounds = player.bounds
 
         move = Vector.zero()
         if bullet:
             bullet_dist = player.position.distance(bullet.position)
-            projection = bullet.direction * bullet_dist + bullet.position
+            projection = (bullet.direction * bullet_dist).add_vec(bullet.position)
             margin = player.radius + bullet.radius + 100
 
             if player.position.x - margin <= projection.x <= player.position.x + margin:
@@ -190,7 +195,7 @@ class SmartStrategy(Strategy):
                 move.y = 1 * abs(bullet.direction.x) * (1 if projection.y < player.position.y else -1)
 
         radius = 100
-        if player.position.distance(target.position) <= radius:
+        if player.position.distance_sq(target.position) <= radius * radius:
             opposite = player.position - target.position
             move = opposite.normalize()
 
@@ -204,21 +209,14 @@ class SmartStrategy(Strategy):
         elif (player.position.y - player.radius - padding) <= bounds.y_min:
             move.y = 1
 
-        return move, Vector.zero()
+        return move, _ZERO
 
     def _get_closest_dangerous_bullet(self) -> Optional[BulletInformation]:
         """Returns the bullet information of the closest bullet to the player's position travelling towards the player.
         """
-        if len(self.info.bullets) == 0:
+        if len(self.info.bullet_pos) == 0:
             return None
 
-        player = self.info.players[self.player_id]
-
-        dangerous_bullets = []
-        for bullet in self.info.bullets:
-            if player.position.distance(bullet.position) > \
-                    player.position.distance(bullet.position + bullet.direction):
-                    dangerous_bullets.append(bullet)
-
-        return min(dangerous_bullets, key=lambda bullet: player.position.distance(bullet.position)) \
-            if dangerous_bullets else None
+        position = self.me.position
+        closest = kernels.closest_approaching(position.x, position.y, self.info.bullet_pos, self.info.bullet_dir)
+        return self.info.get_bullet(closest) if closest >= 0 else None
@@ -11,6 +11,8 @@ import math
 class Vector:
     """Represents a vector in the game with x- and y- values.
     """
+    __slots__ = ("x", "y")
+    __hash__ = None
 
     x: float
     y: float
@@ -31,19 +33,27 @@ class Vector:
     def magnitude(self) -> float:
         """Returns the magnitude of the vector.
         """
-        return math.sqrt(self.x ** 2 + self.y ** 2)
+        return math.hypot(self.x, self.y)
 
     @property
     def angle(self) -> float:
         """Returns the angle of this vector in radians from the positive horizontal counter-clockwise.
         """
-        return math.tan(self.y / self.x)
+        return math.atan2(self.y, self.x)
 
     def distance(self, vector: 'Vector') -> float:
         """Returns the distance between this vector and the given <vector> in space.
         """
         return math.hypot(self.x - vector.x, self.y - vector.y)
 
+    def distance_sq(self, vector: 'Vector') -> float:
+        """Returns the squared distance between this vector and the given <vector> in space, which orders the same
+        as the distance without taking a square root.
+        """
+        dx = self.x - vector.x
+        dy = self.y - vector.y
+        return dx * dx + dy * dy
+
     def duplicate(self) -> 'Vector':
         """Returns a duplicate of this position.
         """
@@ -52,12 +62,17 @@ class Vector:
     def seminormalize(self, magnitude: float) -> 'Vector':
         """Returns a new vector in the same direction but with magnitude <magnitude> if and only if the vector has
         magnitude more than <magnitude>. Otherwise returns the vector."""
-        return self * (magnitude / self.magnitude) if self.magnitude > magnitude else self
+        current = math.hypot(self.x, self.y)
+        if current <= magnitude:
+            return self
+        scale = magnitude / current
+        return Vector(self.x * scale, self.y * scale)
 
     def normalize(self) -> 'Vector':
         """Returns a new vector in the same direction but with magnitude 1, or the zero vector.
         """
-        return self / self.magnitude if self.magnitude != 0 else Vector(0, 0)
+        magnitude = math.hypot(self.x, self.y)
+        return Vector(self.x / magnitude, self.y / magnitude) if magnitude != 0 else Vector(0, 0)
 
     def __round__(self, n=None) -> 'Vector':
         """Returns a new position rounded to the nearest whole coordinates.
@@ -76,6 +91,30 @@ class Vector:
         return Vector(self.x + other.x, self.y + other.y) \
             if isinstance(other, Vector) else Vector(self.x + other, self.y + other)
 
+    def add_vec(self, other: 'Vector') -> 'Vector':
+        """Returns a new vector which is the result of adding each component of this vector and the <other> vector.
+        """
+        return Vector(self.x + other.x, self.y + other.y)
+
+    def add_scalar(self, other: float) -> 'Vector':
+        """Returns a new vector which is the result of adding the number <other> to all components of this vector.
+        """
+        return Vector(self.x + other, self.y + other)
+
+    def iadd_vec(self, other: 'Vector') -> 'Vector':
+        """Modifies this vector to the result of adding each component of this vector and the <other> vector.
+        """
+        self.x += other.x
+        self.y += other.y
+        return self
+
+    def iadd_scalar(self, other: float) -> 'Vector':
+        """Modifies this vector to the result of adding the number <other> to all components of this vector.
+        """
+        self.x += other
+        self.y += other
+        return self
+
     def __iadd__(self, other: Any) -> 'Vector':
         """Modifies this vector to the result of adding each component of the vectors if it is a vector or
         adding the number to all components of the vector otherwise.
@@ -134,8 +173,10 @@ class Vector:
     def __eq__(self, other: Any) -> bool:
         """Returns whether or not two position objects are equal.
         """
+        if other is self:
+            return True
         if not isinstance(other, Vector):
-            return False
+            return NotImplemented
         return other.x == self.x and other.y == self.y
 
     def __str__(self) -> str:
@@ -153,51 +194,81 @@ class Vector:
         return "<nshoot.utils.Vector (x={}, y={})>".format(str(self.x), str(self.y))
 
 
+class FrozenVector(Vector):
+    """Represents a vector that can not be modified, safe to share between any number of users.
+
+    Operations that would modify the vector in place raise an AttributeError, all others return plain vectors.
+    """
+    __slots__ = ()
+
+    def __init__(self, x: float, y: float) -> None:
+        """Initialize a frozen vector with the given <x> and <y> values.
+        """
+        object.__setattr__(self, "x", x)
+        object.__setattr__(self, "y", y)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        """Raises an AttributeError as frozen vectors can not be modified.
+        """
+        raise AttributeError("Can not modify a frozen vector!")
+
+    def __delattr__(self, name: str) -> None:
+        """Raises an AttributeError as frozen vectors can not be modified.
+        """
+        raise AttributeError("Can not modify a frozen vector!")
+
+
 class Bounds:
     """Bounds for a player that has methods to restrict positioning.
     """
-    x_max: Optional[float]
-    x_min: Optional[float]
-    y_max: Optional[float]
-    y_min: Optional[float]
+    __slots__ = ("x_max", "x_min", "y_max", "y_min")
+    __hash__ = None
+
+    x_max: float
+    x_min: float
+    y_max: float
+    y_min: float
 
     def __init__(self, *,
                  x_max: Optional[float] = None, x_min: Optional[float] = None,
                  y_max: Optional[float] = None, y_min: Optional[float] = None) -> None:
-        """Initialize a bounds object with the given bounds. Only keyword arguments are accepted.
+        """Initialize a bounds object with the given bounds, where any bound not given is infinite.
+        Only keyword arguments are accepted.
         """
-        if x_min is not None and x_max is not None:
-            if x_min > x_max:
-                raise ValueError("Invalid bounds input!")
-        if y_min is not None and y_max is not None:
-            if y_min > y_max:
-                raise ValueError("Invalid bounds input!")
+        self.x_max = x_max if x_max is not None else math.inf
+        self.x_min = x_min if x_min is not None else -math.inf
+        self.y_max = y_max if y_max is not None else math.inf
+        self.y_min = y_min if y_min is not None else -math.inf
 
-        self.x_max = x_max
-        self.x_min = x_min
-        self.y_max = y_max
-        self.y_min = y_min
+        if self.x_min > self.x_max or self.y_min > self.y_max:
+            raise ValueError("Invalid bounds input!")
 
     def bound_position(self, position: Vector, padding: int) -> None:
         """Bound the given <position> using this bounding object in place, with the given <padding> on any side
         of the position.
         """
-        if self.x_min is not None:
-            x_min_padding = self.x_min + padding
-            if position.x < x_min_padding:
-                position.x = x_min_padding
-        if self.x_max is not None:
-            x_max_padding = self.x_max - padding
-            if position.x > x_max_padding:
-                position.x = x_max_padding
-        if self.y_min is not None:
-            y_min_padding = self.y_min + padding
-            if position.y < y_min_padding:
-                position.y = y_min_padding
-        if self.y_max is not None:
-            y_max_padding = self.y_max - padding
-            if position.y > y_max_padding:
-                position.y = y_max_padding
+        if position.x < self.x_min + padding:
+            position.x = self.x_min + padding
+        if position.x > self.x_max - padding:
+            position.x = self.x_max - padding
+        if position.y < self.y_min + padding:
+            position.y = self.y_min + padding
+        if position.y > self.y_max - padding:
+            position.y = self.y_max - padding
+
+    def with_padding(self, padding: float) -> 'Bounds':
+        """Returns new bounds that are narrower by the given <padding> on every side, which bound a position the same
+        way that these bounds do with that padding.
+
+        The padded bounds are not validated, since a side narrower than twice the <padding> is valid here: its
+        minimum ends up past its maximum, which clamps every position to the maximum just like bounding with padding.
+        """
+        bounds = Bounds.__new__(Bounds)
+        bounds.x_max = self.x_max - padding
+        bounds.x_min = self.x_min + padding
+        bounds.y_max = self.y_max - padding
+        bounds.y_min = self.y_min + padding
+        return bounds
 
     def duplicate(self) -> 'Bounds':
         """Returns a duplicate of this Bounds.
@@ -207,8 +278,8 @@ class Bounds:
     def __eq__(self, other: object) -> bool:
         """Returns whether or not two bounds objects are equal.
         """
-        if not type(self) == type(other):
-            return False
+        if other.__class__ is not Bounds:
+            return NotImplemented
         other: Bounds
         return (self.x_max == other.x_max and self.x_min == other.x_min
                 and self.y_max == other.y_max and self.y_min == other.y_min)
@@ -229,3 +300,4 @@ class Bounds:
         """
         return "<nshoot.utils.Bounds (x:{}-{}, y:{}-{})>".format(str(self.x_min), str(self.x_max),
                                                                  str(self.y_min), str(self.y_max))
+